@@ -8,17 +8,26 @@ import discord
 from discord.ext import tasks
 import asyncio
 import logging
-from typing import List
+from typing import List, Tuple
+from aiolimiter import AsyncLimiter
 
 from config import Config
 from database import Database
 from utils import setup_logging, format_discord_message, generate_listing_id
-from scrapers import PickNPullScraper, IPullUPullScraper, BucksAutoScraper
+from scrapers import (
+    PickNPullScraper,
+    IPullUPullScraper,
+    BucksAutoScraper,
+    create_session,
+)
 
 
 # Set up logging
 logger = setup_logging(Config.LOG_LEVEL)
 
+# Discord rejects messages longer than this many characters
+DISCORD_MESSAGE_LIMIT = 2000
+
 
 class DodgeTruckNotifier(discord.Client):
     """Discord bot for Dodge truck salvage yard notifications."""
@@ -33,25 +42,40 @@ class DodgeTruckNotifier(discord.Client):
         
         self.database = Database(Config.DATABASE_PATH)
         self.scrapers = []
+        self.session = None
         self.channel_id = int(Config.DISCORD_CHANNEL_ID)
+        self.channel = None
         self.test_mode = Config.TEST_MODE
+        self.check_interval = Config.CHECK_INTERVAL_MINUTES
+        self.consecutive_failures = 0
+        # Held for a whole check cycle; scrapers keep per-cycle state, so
+        # manual and scheduled checks must not overlap
+        self.check_lock = asyncio.Lock()
+        self.notification_limiter = AsyncLimiter(
+            Config.NOTIFICATION_RATE_LIMIT, Config.NOTIFICATION_RATE_PERIOD
+        )
     
     async def setup_hook(self):
         """Set up the bot after login."""
         # Initialize database
         await self.database.initialize()
         
+        # Share one HTTP session so scrapers reuse pooled connections
+        self.session = create_session(Config)
+        
         # Initialize scrapers
         self.scrapers = [
-            PickNPullScraper(Config),
-            IPullUPullScraper(Config),
-            BucksAutoScraper(Config),
+            PickNPullScraper(Config, self.session, self.database),
+            IPullUPullScraper(Config, self.session, self.database),
+            BucksAutoScraper(Config, self.session, self.database),
         ]
         
         for scraper in self.scrapers:
             await scraper.initialize()
         
-        # Start the periodic check task
+        # Start the periodic check task, using the interval as configured now
+        # rather than when the class was defined
+        self.check_listings.change_interval(minutes=self.check_interval)
         self.check_listings.start()
         
         logger.info("Bot setup complete")
@@ -63,8 +87,8 @@ class DodgeTruckNotifier(discord.Client):
         logger.info(f"Check interval: {Config.CHECK_INTERVAL_MINUTES} minutes")
         logger.info(f"Test mode: {self.test_mode}")
         
-        # Log channel info
-        channel = self.get_channel(self.channel_id)
+        # Resolve the notification channel once and keep it for later sends
+        channel = self.get_notification_channel()
         if channel:
             logger.info(f"Notification channel: #{channel.name} in {channel.guild.name}")
         else:
@@ -79,9 +103,13 @@ class DodgeTruckNotifier(discord.Client):
         # Simple command to manually trigger a check
         if message.content.startswith("!check"):
             logger.info(f"Manual check triggered by {message.author}")
+            if self.check_lock.locked():
+                await message.channel.send("⏳ A check is already running, try again shortly.")
+                return
+            
             await message.channel.send("🔍 Checking salvage yards for new listings...")
             
-            new_count = await self.check_all_scrapers()
+            new_count, _ = await self.check_all_scrapers()
             
             if new_count > 0:
                 await message.channel.send(f"✅ Found {new_count} new listing(s)!")
@@ -94,7 +122,7 @@ class DodgeTruckNotifier(discord.Client):
             status_msg = (
                 f"📊 **Bot Status**\n"
                 f"• Total listings tracked: {listing_count}\n"
-                f"• Check interval: {Config.CHECK_INTERVAL_MINUTES} minutes\n"
+                f"• Check interval: {self.check_interval} minutes\n"
                 f"• Active scrapers: {len(self.scrapers)}\n"
                 f"• Test mode: {self.test_mode}"
             )
@@ -106,10 +134,35 @@ class DodgeTruckNotifier(discord.Client):
         logger.info("Starting scheduled check of salvage yards")
         
         try:
-            new_count = await self.check_all_scrapers()
+            new_count, failed_count = await self.check_all_scrapers()
             logger.info(f"Scheduled check complete. Found {new_count} new listing(s)")
+            
+            # Back off only when no yard could be checked at all; scrapers
+            # that aren't implemented yet never fetch, so leave them out
+            active_count = sum(1 for scraper in self.scrapers if scraper.IMPLEMENTED)
+            if active_count and failed_count >= active_count:
+                logger.warning("All scrapers failed during scheduled check")
+                self.consecutive_failures += 1
+            else:
+                self.consecutive_failures = 0
         except Exception as e:
             logger.error(f"Error during scheduled check: {e}", exc_info=True)
+            self.consecutive_failures += 1
+        
+        self.adjust_check_interval()
+    
+    def adjust_check_interval(self):
+        """Back off exponentially after failed checks and restore on success."""
+        base = Config.CHECK_INTERVAL_MINUTES
+        interval = min(
+            base * (2 ** self.consecutive_failures),
+            max(base, Config.MAX_CHECK_INTERVAL_MINUTES)
+        )
+        
+        if interval != self.check_interval:
+            self.check_interval = interval
+            self.check_listings.change_interval(minutes=interval)
+            logger.info(f"Check interval changed to {interval} minutes")
     
     @check_listings.before_loop
     async def before_check_listings(self):
@@ -117,62 +170,257 @@ class DodgeTruckNotifier(discord.Client):
         await self.wait_until_ready()
         logger.info("Bot ready, starting periodic checks")
     
-    async def check_all_scrapers(self) -> int:
+    async def check_all_scrapers(self) -> Tuple[int, int]:
         """
         Check all scrapers for new listings.
         
+        Scrapers run concurrently and feed a queue; a single consumer
+        processes their listings in batches as they arrive, so database
+        and Discord work overlaps with scrapers that are still fetching.
+        Only one check runs at a time; others wait for it to finish.
+        
         Returns:
-            Number of new listings found
+            Tuple of (number of new listings found, number of scrapers
+            that failed)
         """
+        async with self.check_lock:
+            queue: asyncio.Queue = asyncio.Queue()
+            consumer = asyncio.create_task(self._consume_listings(queue))
+            
+            # Dispatch all scrapers concurrently; each one is dominated by network I/O
+            results = await asyncio.gather(
+                *(self._produce_listings(scraper, queue) for scraper in self.scrapers)
+            )
+            
+            # Signal the consumer that no more listings are coming
+            await queue.put(None)
+            new_listing_count, stored = await consumer
+            
+            # Only remember pages as checked once their listings are stored;
+            # otherwise they are re-checked next time even if unchanged
+            for scraper, succeeded in zip(self.scrapers, results):
+                if stored and succeeded:
+                    await scraper.commit_page_cache()
+                else:
+                    scraper.discard_page_cache()
+            
+            return new_listing_count, results.count(False)
+    
+    async def _produce_listings(self, scraper, queue: asyncio.Queue) -> bool:
+        """
+        Run one scraper and queue its listings for processing.
+        
+        Args:
+            scraper: The scraper to run
+            queue: Queue feeding the listing consumer
+        
+        Returns:
+            False if the scraper raised or none of its pages could be
+            fetched, True otherwise
+        """
+        logger.info(f"Checking {scraper.get_name()}")
+        
+        try:
+            listings = await scraper.scrape()
+        except Exception as e:
+            logger.error(f"Error checking {scraper.get_name()}: {e}", exc_info=True)
+            return False
+        
+        for listing in listings:
+            await queue.put(listing)
+        
+        if scraper.last_scrape_failed:
+            logger.warning(f"Could not fetch any pages from {scraper.get_name()}")
+            return False
+        return True
+    
+    async def _consume_listings(self, queue: asyncio.Queue) -> Tuple[int, bool]:
+        """
+        Process queued listings in batches until the end-of-input marker.
+        
+        A batch is flushed once it holds LISTING_BATCH_SIZE listings or
+        LISTING_BATCH_SECONDS have passed since its first listing arrived.
+        
+        Args:
+            queue: Queue of listing dictionaries, terminated by None
+        
+        Returns:
+            Tuple of (number of new listings found, whether every batch
+            was processed successfully)
+        """
+        loop = asyncio.get_running_loop()
+        handled_ids = set()
         new_listing_count = 0
+        stored = True
+        done = False
         
-        for scraper in self.scrapers:
+        while not done:
+            listing = await queue.get()
+            if listing is None:
+                break
+            
+            batch = [listing]
+            deadline = loop.time() + Config.LISTING_BATCH_SECONDS
+            while len(batch) < Config.LISTING_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    listing = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if listing is None:
+                    done = True
+                    break
+                batch.append(listing)
+            
             try:
-                logger.info(f"Checking {scraper.get_name()}")
-                listings = await scraper.scrape()
-                
-                for listing in listings:
-                    # Check if listing is new
-                    listing_id = generate_listing_id(listing)
-                    
-                    if not await self.database.is_listing_seen(listing_id):
-                        # New listing found
-                        logger.info(f"New listing found: {listing_id}")
-                        
-                        # Add to database
-                        await self.database.add_listing(listing)
-                        
-                        # Send Discord notification
-                        await self.send_notification(listing)
-                        
-                        new_listing_count += 1
-                
+                new_listing_count += await self._process_batch(batch, handled_ids)
             except Exception as e:
-                logger.error(f"Error checking {scraper.get_name()}: {e}", exc_info=True)
+                logger.error(f"Error processing scraped listings: {e}", exc_info=True)
+                stored = False
         
-        return new_listing_count
+        return new_listing_count, stored
     
-    async def send_notification(self, listing: dict):
+    async def _process_batch(self, batch: List[dict], handled_ids: set) -> int:
         """
-        Send a notification to Discord for a new listing.
+        Store and announce the new listings in a batch.
+        
+        Errors propagate so the caller knows the batch was not stored.
         
         Args:
-            listing: Dictionary containing listing information
+            batch: Listing dictionaries to process
+            handled_ids: IDs already processed this cycle; updated in place
+        
+        Returns:
+            Number of new listings in the batch
         """
+        # Scrapers stamp IDs as they build listings; fill in any that didn't
+        for listing in batch:
+            if "_id" not in listing:
+                listing["_id"] = generate_listing_id(listing)
+        
+        # Look up the whole batch in a single query
+        unseen_ids = await self.database.filter_unseen(
+            [listing["_id"] for listing in batch]
+        )
+        
+        new_listings = []
+        for listing in batch:
+            listing_id = listing["_id"]
+            # Check if listing is new (and not already handled this cycle)
+            if listing_id not in unseen_ids or listing_id in handled_ids:
+                continue
+            handled_ids.add(listing_id)
+            
+            # New listing found
+            logger.info(f"New listing found: {listing_id}")
+            new_listings.append(listing)
+        
+        # Add all new listings to the database in one transaction
+        await self.database.add_listings(new_listings)
+        
+        # Send Discord notifications
+        await self.send_notifications(new_listings)
+        
+        return len(new_listings)
+    
+    def get_notification_channel(self):
+        """
+        Get the notification channel, caching it after the first lookup.
+        
+        Returns:
+            The Discord channel, or None if it could not be found
+        """
+        if self.channel is None:
+            self.channel = self.get_channel(self.channel_id)
+        return self.channel
+    
+    async def send_notifications(self, listings: List[dict]):
+        """
+        Send notifications to Discord for several new listings.
+        
+        Listings are combined into as few messages as Discord's length
+        limit and NOTIFICATION_BATCH_SIZE allow, and the messages are
+        sent concurrently.
+        
+        Args:
+            listings: List of dictionaries containing listing information
+        """
+        if not listings:
+            return
+        
         if self.test_mode:
-            logger.info(f"TEST MODE: Would send notification: {listing}")
+            for listing in listings:
+                logger.info(f"TEST MODE: Would send notification: {listing}")
+            return
+        
+        channel = self.get_notification_channel()
+        if not channel:
+            logger.error(f"Channel {self.channel_id} not found")
             return
         
+        await asyncio.gather(
+            *(self.send_notification_group(group, channel)
+              for group in self._group_notifications(listings))
+        )
+    
+    def _group_notifications(self, listings: List[dict]) -> List[List[tuple]]:
+        """
+        Split listings into groups that each fit in one Discord message.
+        
+        Args:
+            listings: List of dictionaries containing listing information
+        
+        Returns:
+            Groups of (listing, formatted message) pairs
+        """
+        groups = []
+        group = []
+        length = 0
+        
+        for listing in listings:
+            message = format_discord_message(listing)
+            # Messages are separated by a blank line when combined
+            added = len(message) + (1 if group else 0)
+            if group and (
+                len(group) >= Config.NOTIFICATION_BATCH_SIZE
+                or length + added > DISCORD_MESSAGE_LIMIT
+            ):
+                groups.append(group)
+                group = []
+                length = 0
+                added = len(message)
+            group.append((listing, message))
+            length += added
+        
+        if group:
+            groups.append(group)
+        
+        return groups
+    
+    async def send_notification_group(self, group: List[tuple], channel=None):
+        """
+        Send one Discord message announcing a group of new listings.
+        
+        Args:
+            group: (listing, formatted message) pairs from _group_notifications
+            channel: Channel to send to; defaults to the notification channel
+        """
         try:
-            channel = self.get_channel(self.channel_id)
+            if channel is None:
+                channel = self.get_notification_channel()
             if not channel:
                 logger.error(f"Channel {self.channel_id} not found")
                 return
             
-            message = format_discord_message(listing)
-            await channel.send(message)
+            # Stay within Discord's per-channel message rate limit
+            async with self.notification_limiter:
+                await channel.send("\n".join(message for _, message in group))
             
-            logger.info(f"Notification sent for listing: {generate_listing_id(listing)}")
+            for listing, _ in group:
+                listing_id = listing.get("_id") or generate_listing_id(listing)
+                logger.info(f"Notification sent for listing: {listing_id}")
         
         except discord.errors.Forbidden:
             logger.error("Bot does not have permission to send messages to the channel")
@@ -187,6 +435,13 @@ class DodgeTruckNotifier(discord.Client):
         for scraper in self.scrapers:
             await scraper.close()
         
+        if self.session:
+            await self.session.close()
+            self.session = None
+        
+        # Close database connection
+        await self.database.close()
+        
         await super().close()
 
 
@@ -20,17 +20,33 @@ class Config:
     
     # Bot Configuration
     CHECK_INTERVAL_MINUTES: int = int(os.getenv("CHECK_INTERVAL_MINUTES", "30"))
+    MAX_CHECK_INTERVAL_MINUTES: int = 240  # Upper bound when backing off after failures
+    LISTING_BATCH_SIZE: int = 50  # Max listings processed per database batch
+    LISTING_BATCH_SECONDS: float = 1.0  # Max wait to fill a batch
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     TEST_MODE: bool = os.getenv("TEST_MODE", "false").lower() == "true"
     
+    # Discord allows roughly 5 messages per 5 seconds per channel
+    NOTIFICATION_RATE_LIMIT: int = 5
+    NOTIFICATION_RATE_PERIOD: float = 5.0
+    NOTIFICATION_BATCH_SIZE: int = 10  # Max listings combined into one message
+    
     # Database Configuration
     DATABASE_PATH: str = os.getenv("DATABASE_PATH", "listings.db")
     
     # Scraping Configuration
     REQUEST_TIMEOUT: int = 30
-    REQUEST_DELAY: float = 3.0  # Delay between requests in seconds
+    REQUEST_DELAY: float = 3.0  # Minimum seconds between requests to the same host
     MAX_RETRIES: int = 3
     RETRY_DELAY: int = 5  # Initial retry delay in seconds
+    MAX_RETRY_AFTER: int = 120  # Cap on server-requested Retry-After delays
+    MAX_CONCURRENT_REQUESTS: int = 10  # Max in-flight requests per scraper
+    
+    # HTTP Connection Pool (shared by all scrapers)
+    CONNECTION_LIMIT: int = 20
+    CONNECTION_LIMIT_PER_HOST: int = 4
+    DNS_CACHE_TTL: int = 300  # Seconds to cache DNS lookups
+    KEEPALIVE_TIMEOUT: int = 30  # Seconds to keep idle connections open
     
     # Search Criteria
     TARGET_MAKE: str = "Dodge"
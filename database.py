@@ -5,12 +5,17 @@ Handles SQLite database operations for storing and tracking listings.
 
 import aiosqlite
 import logging
-from typing import Optional, List
+from typing import Optional, List, Set
 from datetime import datetime
 
+from utils import generate_listing_id
+
 
 logger = logging.getLogger("dodge_truck_notifier.database")
 
+# Maximum number of bound parameters used in a single batched query
+SQL_BATCH_SIZE = 500
+
 
 class Database:
     """Database manager for tracking seen listings."""
@@ -23,41 +28,118 @@ class Database:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        self.db: Optional[aiosqlite.Connection] = None
     
     async def initialize(self):
-        """Create database tables if they don't exist."""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS listings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    listing_id TEXT UNIQUE NOT NULL,
-                    yard_name TEXT,
-                    location TEXT,
-                    year INTEGER,
-                    make TEXT,
-                    model TEXT,
-                    stock_number TEXT,
-                    url TEXT,
-                    arrival_date TEXT,
-                    first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_listing_id 
-                ON listings(listing_id)
-            """)
-            
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_first_seen 
-                ON listings(first_seen)
-            """)
-            
-            await db.commit()
+        """Open the database connection and create tables if they don't exist."""
+        if self.db is None:
+            self.db = await aiosqlite.connect(self.db_path)
+            # WAL lets reads proceed during writes; NORMAL sync is safe with WAL
+            await self.db.execute("PRAGMA journal_mode=WAL")
+            await self.db.execute("PRAGMA synchronous=NORMAL")
+            # Memory-map the file and keep a larger page cache / temp tables
+            # in memory to cut read syscalls on hot index pages
+            await self.db.execute("PRAGMA mmap_size=268435456")
+            await self.db.execute("PRAGMA cache_size=-20000")
+            await self.db.execute("PRAGMA temp_store=MEMORY")
+            self.db.row_factory = aiosqlite.Row
+        
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS listings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                listing_id TEXT UNIQUE NOT NULL,
+                yard_name TEXT,
+                location TEXT,
+                year INTEGER,
+                make TEXT,
+                model TEXT,
+                stock_number TEXT,
+                url TEXT,
+                arrival_date TEXT,
+                first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_checked TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # listing_id is UNIQUE, which already gives it an index; drop the
+        # duplicate one created by older versions to avoid extra write cost
+        await self.db.execute("DROP INDEX IF EXISTS idx_listing_id")
+        
+        await self.db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_first_seen 
+            ON listings(first_seen)
+        """)
+        
+        # Validators and body hashes from previous fetches, used to skip
+        # unchanged pages. Keyed per location since locations may share a
+        # URL; filters records the listing filters the page was checked with
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS page_cache (
+                location TEXT NOT NULL,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT,
+                filters TEXT,
+                PRIMARY KEY (location, url)
+            )
+        """)
+        
+        await self.db.commit()
+        
+        await self._migrate_listing_ids()
         
         logger.info(f"Database initialized at {self.db_path}")
     
+    async def _migrate_listing_ids(self):
+        """
+        Rewrite listing IDs stored by older versions to the hashed format.
+        
+        Older versions used the normalized URL or a pipe-joined composite
+        key; recomputing the ID from the stored fields keeps those listings
+        from being announced again.
+        """
+        async with self.db.execute("""
+            SELECT id, yard_name, location, year, make, model, stock_number, url
+            FROM listings
+            WHERE length(listing_id) != 32 OR listing_id GLOB '*[^0-9a-f]*'
+        """) as cursor:
+            rows = await cursor.fetchall()
+        
+        if not rows:
+            return
+        
+        updates = []
+        for row in rows:
+            # Missing fields were stored as NULL; drop them so they hash
+            # the same as a freshly scraped listing without the field
+            listing = {key: row[key] for key in row.keys() if row[key] is not None}
+            updates.append((generate_listing_id(listing), row["id"]))
+        
+        try:
+            await self.db.executemany(
+                "UPDATE OR IGNORE listings SET listing_id = ? WHERE id = ?",
+                updates
+            )
+            # Anything left over duplicated a listing that was already migrated
+            await self.db.execute("""
+                DELETE FROM listings
+                WHERE length(listing_id) != 32 OR listing_id GLOB '*[^0-9a-f]*'
+            """)
+            await self.db.commit()
+            
+            logger.info(f"Migrated {len(updates)} listing ID(s) to hashed format")
+        except Exception as e:
+            # Don't leave half the UPDATEs pending for the next commit()
+            await self.db.rollback()
+            logger.error(f"Error migrating listing IDs: {e}")
+    
+    async def close(self):
+        """Close the database connection."""
+        if self.db is not None:
+            await self.db.close()
+            self.db = None
+    
     async def is_listing_seen(self, listing_id: str) -> bool:
         """
         Check if a listing has been seen before.
@@ -68,13 +150,40 @@ class Database:
         Returns:
             True if listing exists in database, False otherwise
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT COUNT(*) FROM listings WHERE listing_id = ?",
-                (listing_id,)
+        async with self.db.execute(
+            "SELECT 1 FROM listings WHERE listing_id = ? LIMIT 1",
+            (listing_id,)
+        ) as cursor:
+            result = await cursor.fetchone()
+            return result is not None
+    
+    async def filter_unseen(self, listing_ids: List[str]) -> Set[str]:
+        """
+        Find which listings have not been seen before, in one query per batch.
+        
+        Args:
+            listing_ids: Unique identifiers for the listings to check
+        
+        Returns:
+            Set of listing IDs that do not exist in the database
+        """
+        unseen = set(listing_ids)
+        if not unseen:
+            return unseen
+        
+        ids = list(unseen)
+        # Stay well under SQLite's host-parameter limit
+        for start in range(0, len(ids), SQL_BATCH_SIZE):
+            batch = ids[start:start + SQL_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            async with self.db.execute(
+                f"SELECT listing_id FROM listings WHERE listing_id IN ({placeholders})",
+                batch
             ) as cursor:
-                result = await cursor.fetchone()
-                return result[0] > 0
+                async for row in cursor:
+                    unseen.discard(row[0])
+        
+        return unseen
     
     async def add_listing(self, listing: dict) -> bool:
         """
@@ -86,44 +195,89 @@ class Database:
         Returns:
             True if listing was added, False if it already existed
         """
-        from utils import generate_listing_id
-        
-        listing_id = generate_listing_id(listing)
-        
-        # Check if already exists
-        if await self.is_listing_seen(listing_id):
-            return False
+        listing_id = listing.get("_id") or generate_listing_id(listing)
         
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("""
-                    INSERT INTO listings 
-                    (listing_id, yard_name, location, year, make, model, 
-                     stock_number, url, arrival_date)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    listing_id,
-                    listing.get("yard_name"),
-                    listing.get("location"),
-                    listing.get("year"),
-                    listing.get("make"),
-                    listing.get("model"),
-                    listing.get("stock_number"),
-                    listing.get("url"),
-                    listing.get("arrival_date")
-                ))
-                await db.commit()
+            # The UNIQUE constraint does the existence check; RETURNING yields
+            # no row when the insert was ignored
+            async with self.db.execute("""
+                INSERT OR IGNORE INTO listings 
+                (listing_id, yard_name, location, year, make, model, 
+                 stock_number, url, arrival_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                RETURNING id
+            """, (
+                listing_id,
+                listing.get("yard_name"),
+                listing.get("location"),
+                listing.get("year"),
+                listing.get("make"),
+                listing.get("model"),
+                listing.get("stock_number"),
+                listing.get("url"),
+                listing.get("arrival_date")
+            )) as cursor:
+                row = await cursor.fetchone()
+            await self.db.commit()
+            
+            if row is None:
+                return False
             
             logger.info(f"Added new listing to database: {listing_id}")
             return True
         
-        except aiosqlite.IntegrityError:
-            logger.warning(f"Listing already exists: {listing_id}")
-            return False
         except Exception as e:
             logger.error(f"Error adding listing to database: {e}")
             return False
     
+    async def add_listings(self, listings: List[dict]) -> int:
+        """
+        Add multiple listings to the database in a single transaction.
+        
+        Listings that already exist are skipped. Errors are logged and
+        re-raised so callers know the listings were not stored.
+        
+        Args:
+            listings: List of dictionaries containing listing information
+        
+        Returns:
+            Number of listings actually inserted
+        """
+        if not listings:
+            return 0
+        
+        rows = [
+            (
+                listing.get("_id") or generate_listing_id(listing),
+                listing.get("yard_name"),
+                listing.get("location"),
+                listing.get("year"),
+                listing.get("make"),
+                listing.get("model"),
+                listing.get("stock_number"),
+                listing.get("url"),
+                listing.get("arrival_date")
+            )
+            for listing in listings
+        ]
+        
+        try:
+            cursor = await self.db.executemany("""
+                INSERT OR IGNORE INTO listings 
+                (listing_id, yard_name, location, year, make, model, 
+                 stock_number, url, arrival_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            inserted = cursor.rowcount
+            await self.db.commit()
+            
+            logger.info(f"Added {inserted} new listing(s) to database")
+            return inserted
+        
+        except Exception as e:
+            logger.error(f"Error adding listings to database: {e}")
+            raise
+    
     async def update_last_checked(self, listing_id: str):
         """
         Update the last_checked timestamp for a listing.
@@ -132,16 +286,63 @@ class Database:
             listing_id: Unique identifier for the listing
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("""
-                    UPDATE listings 
-                    SET last_checked = CURRENT_TIMESTAMP 
-                    WHERE listing_id = ?
-                """, (listing_id,))
-                await db.commit()
+            await self.db.execute("""
+                UPDATE listings 
+                SET last_checked = CURRENT_TIMESTAMP 
+                WHERE listing_id = ?
+            """, (listing_id,))
+            await self.db.commit()
         except Exception as e:
             logger.error(f"Error updating last_checked: {e}")
     
+    async def get_page_cache(self, location: str, url: str) -> Optional[dict]:
+        """
+        Get the cached validators and body hash for a location's page.
+        
+        Args:
+            location: Location the page was fetched for
+            url: The URL that was previously fetched
+        
+        Returns:
+            Dictionary with etag, last_modified, body_hash and filters, or None
+        """
+        async with self.db.execute("""
+            SELECT etag, last_modified, body_hash, filters FROM page_cache
+            WHERE location = ? AND url = ?
+        """, (location, url)) as cursor:
+            row = await cursor.fetchone()
+            return dict(row) if row else None
+    
+    async def set_page_cache(
+        self,
+        location: str,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body_hash: Optional[str] = None,
+        filters: Optional[str] = None
+    ):
+        """
+        Store the validators and body hash for a location's page.
+        
+        Args:
+            location: Location the page was fetched for
+            url: The URL that was fetched
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+            body_hash: Hash of the response body, if computed
+            filters: Listing filters the page's listings were checked with
+        """
+        try:
+            await self.db.execute("""
+                INSERT OR REPLACE INTO page_cache 
+                (location, url, etag, last_modified, body_hash, filters)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (location, url, etag, last_modified, body_hash, filters))
+            await self.db.commit()
+        except Exception as e:
+            logger.error(f"Error updating page cache: {e}")
+    
     async def get_all_listings(self) -> List[dict]:
         """
         Get all listings from the database.
@@ -149,14 +350,12 @@ class Database:
         Returns:
             List of listing dictionaries
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("""
-                SELECT * FROM listings 
-                ORDER BY first_seen DESC
-            """) as cursor:
-                rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
+        async with self.db.execute("""
+            SELECT * FROM listings 
+            ORDER BY first_seen DESC
+        """) as cursor:
+            rows = await cursor.fetchall()
+            return [dict(row) for row in rows]
     
     async def get_listing_count(self) -> int:
         """
@@ -165,10 +364,9 @@ class Database:
         Returns:
             Number of listings
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute("SELECT COUNT(*) FROM listings") as cursor:
-                result = await cursor.fetchone()
-                return result[0]
+        async with self.db.execute("SELECT COUNT(*) FROM listings") as cursor:
+            result = await cursor.fetchone()
+            return result[0]
     
     async def cleanup_old_listings(self, days: int = 90):
         """
@@ -178,12 +376,11 @@ class Database:
             days: Number of days to keep listings
         """
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("""
-                    DELETE FROM listings 
-                    WHERE first_seen < datetime('now', '-' || ? || ' days')
-                """, (days,))
-                await db.commit()
+            await self.db.execute("""
+                DELETE FROM listings 
+                WHERE first_seen < datetime('now', '-' || ? || ' days')
+            """, (days,))
+            await self.db.commit()
             
             logger.info(f"Cleaned up listings older than {days} days")
         except Exception as e:
@@ -2,13 +2,14 @@
 Scrapers package for salvage yard websites.
 """
 
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, create_session
 from .picknpull import PickNPullScraper
 from .ipullupull import IPullUPullScraper
 from .bucks_auto import BucksAutoScraper
 
 __all__ = [
     'BaseScraper',
+    'create_session',
     'PickNPullScraper',
     'IPullUPullScraper',
     'BucksAutoScraper',
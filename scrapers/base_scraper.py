@@ -5,98 +5,345 @@ Provides common functionality for all scrapers.
 
 import logging
 import asyncio
+import hashlib
+import random
 import aiohttp
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from abc import ABC, abstractmethod
-from bs4 import BeautifulSoup
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from aiolimiter import AsyncLimiter
+from lxml import html as lxml_html
+from selectolax.lexbor import LexborHTMLParser
+from utils import is_target_location, compile_target_locations, generate_listing_id
 
 
 logger = logging.getLogger("dodge_truck_notifier.scraper")
 
+# Returned by fetch_page when the server reports the page is unchanged (304)
+NOT_MODIFIED = object()
+
+
+def create_session(config) -> aiohttp.ClientSession:
+    """
+    Create an HTTP session with a pooled, keep-alive connector.
+    
+    Args:
+        config: Configuration object
+    
+    Returns:
+        Configured aiohttp ClientSession
+    """
+    connector = aiohttp.TCPConnector(
+        limit=config.CONNECTION_LIMIT,
+        limit_per_host=config.CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=config.DNS_CACHE_TTL,
+        keepalive_timeout=config.KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={'User-Agent': config.USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=config.REQUEST_TIMEOUT)
+    )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+    
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+    
+    Returns:
+        Delay in seconds, or None if missing or unparseable
+    """
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
 
 class BaseScraper(ABC):
     """Abstract base class for salvage yard scrapers."""
     
-    def __init__(self, config):
+    # Scrapers whose listing extraction is still a placeholder set this to
+    # False; they skip fetching and don't count towards failure backoff
+    IMPLEMENTED = True
+    
+    # Per-host rate limiters, shared by all scrapers hitting the same host
+    _host_limiters: Dict[str, AsyncLimiter] = {}
+    
+    def __init__(
+        self,
+        config,
+        session: Optional[aiohttp.ClientSession] = None,
+        database=None
+    ):
         """
         Initialize the scraper.
         
         Args:
             config: Configuration object
+            session: Shared HTTP session; if omitted, the scraper creates
+                and owns its own session
+            database: Database used to cache HTTP validators for
+                conditional GETs; if omitted, pages are always re-fetched
         """
         self.config = config
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.database = database
+        # Page cache entries keyed by (location, url), used when no database
+        # is attached
+        self._page_cache: Dict[Tuple[str, str], dict] = {}
+        # Entries from this check, held back until its listings are stored
+        self._pending_page_cache: Dict[Tuple[str, str], dict] = {}
+        # A page is only skipped if it was last checked with these filters
+        self._filters = repr((
+            config.YEAR_MIN, config.YEAR_MAX, list(config.TARGET_LOCATIONS)
+        ))
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        # Cap in-flight requests so concurrent fetches don't trip rate limits
+        self._sem = asyncio.Semaphore(
+            getattr(config, "MAX_CONCURRENT_REQUESTS", 10)
+        )
+        # Set by scrape_locations when no location could be scraped
+        self.last_scrape_failed = False
+        self._failed_fetches = 0
+        # Compiled once so each listing is matched with a single regex scan
+        self._target_location_re = compile_target_locations(config.TARGET_LOCATIONS)
     
     async def initialize(self):
-        """Initialize the HTTP session."""
+        """Initialize the HTTP session if one was not provided."""
         if not self.session:
-            self.session = aiohttp.ClientSession(
-                headers={'User-Agent': self.config.USER_AGENT},
-                timeout=aiohttp.ClientTimeout(total=self.config.REQUEST_TIMEOUT)
-            )
+            self.session = create_session(self.config)
+            self._owns_session = True
     
     async def close(self):
-        """Close the HTTP session."""
-        if self.session:
+        """Close the HTTP session if this scraper owns it."""
+        if self.session and self._owns_session:
             await self.session.close()
-            self.session = None
+        self.session = None
+    
+    def _get_host_limiter(self, url: str) -> AsyncLimiter:
+        """
+        Get the rate limiter for a URL's host, creating it if needed.
+        
+        Args:
+            url: The URL about to be fetched
+        
+        Returns:
+            AsyncLimiter allowing one request per REQUEST_DELAY for the host
+        """
+        host = urlparse(url).netloc.lower()
+        limiter = self._host_limiters.get(host)
+        if limiter is None:
+            limiter = AsyncLimiter(1, self.config.REQUEST_DELAY)
+            self._host_limiters[host] = limiter
+        return limiter
     
-    async def fetch_page(self, url: str) -> Optional[str]:
+    async def fetch_page(self, url: str, location: str = ""):
         """
         Fetch a page with retry logic.
         
+        Sends If-None-Match / If-Modified-Since when validators from a
+        previous fetch are cached, so unchanged pages cost a 304 only.
+        Servers without validator support are covered by comparing a hash
+        of the body against the previous fetch.
+        
+        New validators are only held as pending until commit_page_cache is
+        called, so a page is not treated as unchanged until its listings
+        have been stored.
+        
         Args:
             url: The URL to fetch
+            location: Location the page is fetched for; locations sharing
+                a URL are cached separately
         
         Returns:
-            Page content as string or None if failed
+            Page content as string, NOT_MODIFIED if the page is unchanged
+            since the last fetch, or None if failed
         """
         if not self.session:
             await self.initialize()
         
+        limiter = self._get_host_limiter(url)
+        
+        key = (location, url)
+        headers = {}
+        cached = await self._get_page_cache(key)
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
         for attempt in range(self.config.MAX_RETRIES):
+            retry_after = None
             try:
                 logger.debug(f"Fetching {url} (attempt {attempt + 1}/{self.config.MAX_RETRIES})")
                 
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        # Rate limiting: delay between requests
-                        await asyncio.sleep(self.config.REQUEST_DELAY)
-                        return content
-                    else:
-                        logger.warning(f"HTTP {response.status} for {url}")
-                
+                # Rate limiting: space out requests to the same host
+                async with limiter:
+                    async with self._sem:
+                        async with self.session.get(url, headers=headers) as response:
+                            if response.status == 304:
+                                logger.debug(f"Not modified since last fetch: {url}")
+                                return NOT_MODIFIED
+                            elif response.status == 200:
+                                body = await response.read()
+                                body_hash = hashlib.blake2b(body, digest_size=16).hexdigest()
+                                
+                                self._pending_page_cache[key] = {
+                                    "etag": response.headers.get("ETag"),
+                                    "last_modified": response.headers.get("Last-Modified"),
+                                    "body_hash": body_hash,
+                                }
+                                
+                                if cached and body_hash == cached["body_hash"]:
+                                    logger.debug(f"Content unchanged since last fetch: {url}")
+                                    return NOT_MODIFIED
+                                
+                                return await response.text()
+                            else:
+                                logger.warning(f"HTTP {response.status} for {url}")
+                                if response.status in (429, 503):
+                                    retry_after = parse_retry_after(
+                                        response.headers.get("Retry-After")
+                                    )
+            
             except asyncio.TimeoutError:
                 logger.warning(f"Timeout fetching {url} (attempt {attempt + 1})")
             except Exception as e:
                 logger.error(f"Error fetching {url}: {e}")
             
-            # Exponential backoff for retries
+            # Honor the server's Retry-After, otherwise use exponential
+            # backoff with jitter so concurrent scrapers don't retry in step
             if attempt < self.config.MAX_RETRIES - 1:
-                delay = self.config.RETRY_DELAY * (2 ** attempt)
-                logger.info(f"Retrying in {delay} seconds...")
+                if retry_after is not None:
+                    delay = min(retry_after, self.config.MAX_RETRY_AFTER)
+                else:
+                    backoff = self.config.RETRY_DELAY * (2 ** attempt)
+                    delay = backoff / 2 + random.uniform(0, backoff / 2)
+                logger.info(f"Retrying in {delay:.1f} seconds...")
                 await asyncio.sleep(delay)
         
         logger.error(f"Failed to fetch {url} after {self.config.MAX_RETRIES} attempts")
+        self._failed_fetches += 1
         return None
     
-    def parse_html(self, html: str) -> Optional[BeautifulSoup]:
+    async def _get_page_cache(self, key: Tuple[str, str]) -> Optional[dict]:
+        """
+        Get the committed page cache entry for a (location, url) key.
+        
+        Args:
+            key: (location, url) of the page
+        
+        Returns:
+            Cache entry, or None if there is none or it was recorded with
+            different listing filters
+        """
+        if self.database:
+            cached = await self.database.get_page_cache(*key)
+        else:
+            cached = self._page_cache.get(key)
+        
+        if cached and cached["filters"] != self._filters:
+            return None
+        return cached
+    
+    async def commit_page_cache(self):
+        """
+        Persist the page cache entries from the latest check.
+        
+        Call once that check's listings have been stored, so pages are
+        only skipped next time if their listings were fully processed.
+        """
+        pending = self._pending_page_cache
+        self._pending_page_cache = {}
+        
+        for (location, url), entry in pending.items():
+            if not self.database:
+                self._page_cache[(location, url)] = dict(entry, filters=self._filters)
+                continue
+            await self.database.set_page_cache(
+                location,
+                url,
+                entry["etag"],
+                entry["last_modified"],
+                entry["body_hash"],
+                self._filters
+            )
+    
+    def discard_page_cache(self):
+        """Drop pending page cache entries so those pages are re-checked."""
+        self._pending_page_cache.clear()
+    
+    def parse_html_tree(self, html: str) -> Optional[lxml_html.HtmlElement]:
         """
-        Parse HTML content with BeautifulSoup.
+        Parse HTML content into an lxml element tree.
+        
+        Suited to table-heavy pages: XPath such as ``//table//tr`` and
+        ``.//td//text()`` walks rows and pulls text in lxml's C core.
         
         Args:
             html: HTML content string
         
         Returns:
-            BeautifulSoup object or None if parsing failed
+            Root lxml HtmlElement or None if parsing failed
         """
         try:
-            return BeautifulSoup(html, 'lxml')
+            return lxml_html.fromstring(html)
         except Exception as e:
             logger.error(f"Error parsing HTML: {e}")
             return None
     
+    def parse_html_fast(self, html: str) -> Optional[LexborHTMLParser]:
+        """
+        Parse HTML content with selectolax.
+        
+        The default parser for CSS selection, text and attribute
+        extraction; use parse_html_tree when XPath is a better fit.
+        
+        Args:
+            html: HTML content string
+        
+        Returns:
+            selectolax LexborHTMLParser or None if parsing failed
+        """
+        try:
+            return LexborHTMLParser(html)
+        except Exception as e:
+            logger.error(f"Error parsing HTML: {e}")
+            return None
+    
+    def select(self, html: str, css: str) -> Iterable:
+        """
+        Select elements from HTML content using a CSS selector.
+        
+        Args:
+            html: HTML content string
+            css: CSS selector
+        
+        Returns:
+            Matching selectolax nodes
+        """
+        tree = self.parse_html_fast(html)
+        if not tree:
+            return []
+        return tree.css(css)
+    
     def is_valid_listing(self, listing: dict) -> bool:
         """
         Check if a listing meets the filter criteria.
@@ -107,28 +354,82 @@ class BaseScraper(ABC):
         Returns:
             True if listing is valid, False otherwise
         """
-        from utils import is_year_in_range, is_target_location
+        # Check make first (should contain "Dodge"): it is the cheapest test
+        # and rejects most listings on a mixed inventory page
+        make = listing.get("make", "").lower()
+        if "dodge" not in make:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Listing filtered out: make {make} is not Dodge")
+            return False
         
-        # Check year range
+        # Check year range (inlined is_year_in_range; this runs per listing)
         year = listing.get("year")
-        if not is_year_in_range(year, self.config.YEAR_MIN, self.config.YEAR_MAX):
-            logger.debug(f"Listing filtered out: year {year} not in range")
+        if year is None or not self.config.YEAR_MIN <= year <= self.config.YEAR_MAX:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Listing filtered out: year {year} not in range")
             return False
         
         # Check location
         location = listing.get("location", "")
-        if not is_target_location(location, self.config.TARGET_LOCATIONS):
-            logger.debug(f"Listing filtered out: location {location} not in targets")
-            return False
-        
-        # Check make (should contain "Dodge")
-        make = listing.get("make", "").lower()
-        if "dodge" not in make:
-            logger.debug(f"Listing filtered out: make {make} is not Dodge")
+        if not is_target_location(location, self._target_location_re):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Listing filtered out: location {location} not in targets")
             return False
         
         return True
     
+    async def scrape_locations(self, locations) -> List[dict]:
+        """
+        Scrape several locations concurrently and combine their listings.
+        
+        Args:
+            locations: Iterable of (location_name, url) pairs
+        
+        Returns:
+            List of listing dictionaries from all locations
+        """
+        locations = list(locations)
+        self._failed_fetches = 0
+        results = await asyncio.gather(
+            *(self._scrape_location(name, url) for name, url in locations),
+            return_exceptions=True
+        )
+        
+        listings = []
+        failures = self._failed_fetches
+        for (location_name, url), result in zip(locations, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error scraping {self.get_name()} {location_name}: {result}")
+                failures += 1
+                # Its listings never made it out, so re-check the page next time
+                self._pending_page_cache.pop((location_name, url), None)
+                continue
+            listings.extend(result)
+        
+        # Each location fetches one page, so this means none could be checked
+        self.last_scrape_failed = bool(locations) and failures >= len(locations)
+        
+        # Stamp each listing's ID here, while other scrapers are still
+        # fetching, so the dedupe step can read it directly
+        for listing in listings:
+            listing["_id"] = generate_listing_id(listing)
+        
+        return listings
+    
+    @abstractmethod
+    async def _scrape_location(self, location_name: str, url: str) -> List[dict]:
+        """
+        Scrape a single location; used by scrape_locations.
+        
+        Args:
+            location_name: Name of the location (e.g. "Calgary")
+            url: URL of the location's inventory page
+        
+        Returns:
+            List of listing dictionaries for this location
+        """
+        pass
+    
     @abstractmethod
     async def scrape(self) -> List[dict]:
         """
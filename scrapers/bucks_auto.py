@@ -5,16 +5,28 @@ Website: bucksauto.ca
 
 import logging
 from typing import List
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, NOT_MODIFIED
 from utils import parse_year
 
 
 logger = logging.getLogger("dodge_truck_notifier.scraper.bucks_auto")
 
+# Buck's Auto Calgary and Edmonton locations
+_LOCATIONS = (
+    ("Calgary", "https://www.bucksauto.ca/location/calgary"),
+    ("Edmonton", "https://www.bucksauto.ca/location/edmonton"),
+)
+
 
 class BucksAutoScraper(BaseScraper):
     """Scraper for Buck's Auto salvage yards."""
     
+    # Listing extraction is still a placeholder; flip this once it is wired
+    # up so we don't fetch and parse pages that can't yield listings
+    IMPLEMENTED = False
+    
+    _logged_unimplemented = False
+    
     def get_name(self) -> str:
         """Get the name of the salvage yard."""
         return "Buck's Auto"
@@ -26,56 +38,72 @@ class BucksAutoScraper(BaseScraper):
         Returns:
             List of listing dictionaries
         """
+        if not self.IMPLEMENTED:
+            if not self._logged_unimplemented:
+                logger.info("Buck's Auto scraper is not implemented yet, skipping")
+                self._logged_unimplemented = True
+            return []
+        
+        # Locations are independent, so fetch them concurrently
+        return await self.scrape_locations(_LOCATIONS)
+    
+    async def _scrape_location(self, location_name: str, base_url: str) -> List[dict]:
+        """
+        Scrape a single Buck's Auto location.
+        
+        Args:
+            location_name: Name of the location (e.g. "Calgary")
+            base_url: URL of the location's inventory page
+        
+        Returns:
+            List of listing dictionaries for this location
+        """
         listings = []
         
-        # Buck's Auto Calgary and Edmonton locations
-        locations = [
-            ("Calgary", "https://www.bucksauto.ca/location/calgary"),
-            ("Edmonton", "https://www.bucksauto.ca/location/edmonton"),
-        ]
+        logger.info(f"Scraping Buck's Auto {location_name}")
+        
+        # This is a placeholder implementation
+        # Real implementation would need to:
+        # 1. Determine if Buck's Auto has an API or searchable inventory
+        # 2. Navigate to inventory search
+        # 3. Filter for Dodge trucks in year range
+        # 4. Parse and extract results
+        
+        html = await self.fetch_page(base_url, location_name)
+        if html is NOT_MODIFIED:
+            logger.info(f"Buck's Auto {location_name} unchanged since last check")
+            return listings
+        
+        if not html:
+            logger.warning(f"Failed to fetch Buck's Auto {location_name}")
+            return listings
+        
+        # Inventory is laid out in tables, which lxml XPath walks directly
+        tree = self.parse_html_tree(html)
+        if tree is None:
+            return listings
+        
+        # Real scraping logic would go here
+        # This is a placeholder that would need to be implemented
+        # based on actual website structure, e.g.:
+        # for row in tree.xpath('//table//tr'):
+        #     cell_texts = [t.strip() for t in row.xpath('./td//text() | ./th//text()')]
+        
+        # Example listing structure:
+        # listing = {
+        #     "yard_name": self.get_name(),
+        #     "location": location_name,
+        #     "year": 2020,
+        #     "make": "Dodge",
+        #     "model": "RAM 3500",
+        #     "stock_number": "BA-789",
+        #     "url": f"{base_url}/inventory/BA-789",
+        #     "arrival_date": "2026-02-12",
+        # }
+        # 
+        # if self.is_valid_listing(listing):
+        #     listings.append(listing)
         
-        for location_name, base_url in locations:
-            try:
-                logger.info(f"Scraping Buck's Auto {location_name}")
-                
-                # This is a placeholder implementation
-                # Real implementation would need to:
-                # 1. Determine if Buck's Auto has an API or searchable inventory
-                # 2. Navigate to inventory search
-                # 3. Filter for Dodge trucks in year range
-                # 4. Parse and extract results
-                
-                html = await self.fetch_page(base_url)
-                if not html:
-                    logger.warning(f"Failed to fetch Buck's Auto {location_name}")
-                    continue
-                
-                soup = self.parse_html(html)
-                if not soup:
-                    continue
-                
-                # Real scraping logic would go here
-                # This is a placeholder that would need to be implemented
-                # based on actual website structure
-                
-                # Example listing structure:
-                # listing = {
-                #     "yard_name": self.get_name(),
-                #     "location": location_name,
-                #     "year": 2020,
-                #     "make": "Dodge",
-                #     "model": "RAM 3500",
-                #     "stock_number": "BA-789",
-                #     "url": f"{base_url}/inventory/BA-789",
-                #     "arrival_date": "2026-02-12",
-                # }
-                # 
-                # if self.is_valid_listing(listing):
-                #     listings.append(listing)
-                
-                logger.info(f"Found {len(listings)} valid listings at Buck's Auto {location_name}")
-                
-            except Exception as e:
-                logger.error(f"Error scraping Buck's Auto {location_name}: {e}")
+        logger.info(f"Found {len(listings)} valid listings at Buck's Auto {location_name}")
         
         return listings
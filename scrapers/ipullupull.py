@@ -5,12 +5,18 @@ Website: ipullupull.com
 
 import logging
 from typing import List
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, NOT_MODIFIED
 from utils import parse_year
 
 
 logger = logging.getLogger("dodge_truck_notifier.scraper.ipullupull")
 
+# IPull-UPull Calgary and Edmonton locations
+_LOCATIONS = (
+    ("Calgary", "https://ipullupull.com/locations/calgary/"),
+    ("Edmonton", "https://ipullupull.com/locations/edmonton/"),
+)
+
 
 class IPullUPullScraper(BaseScraper):
     """Scraper for IPull-UPull salvage yards."""
@@ -26,56 +32,63 @@ class IPullUPullScraper(BaseScraper):
         Returns:
             List of listing dictionaries
         """
+        # Locations are independent, so fetch them concurrently
+        return await self.scrape_locations(_LOCATIONS)
+    
+    async def _scrape_location(self, location_name: str, base_url: str) -> List[dict]:
+        """
+        Scrape a single IPull-UPull location.
+        
+        Args:
+            location_name: Name of the location (e.g. "Calgary")
+            base_url: URL of the location's inventory page
+        
+        Returns:
+            List of listing dictionaries for this location
+        """
         listings = []
         
-        # IPull-UPull Calgary and Edmonton locations
-        locations = [
-            ("Calgary", "https://ipullupull.com/locations/calgary/"),
-            ("Edmonton", "https://ipullupull.com/locations/edmonton/"),
-        ]
+        logger.info(f"Scraping IPull-UPull {location_name}")
+        
+        # This is a placeholder implementation
+        # Real implementation would need to:
+        # 1. Check if IPull-UPull has an inventory API
+        # 2. Navigate to the inventory page
+        # 3. Filter for Dodge trucks
+        # 4. Parse results
+        
+        html = await self.fetch_page(base_url, location_name)
+        if html is NOT_MODIFIED:
+            logger.info(f"IPull-UPull {location_name} unchanged since last check")
+            return listings
+        
+        if not html:
+            logger.warning(f"Failed to fetch IPull-UPull {location_name}")
+            return listings
+        
+        tree = self.parse_html_fast(html)
+        if not tree:
+            return listings
+        
+        # Real scraping logic would go here
+        # This is a placeholder that would need to be implemented
+        # based on actual website structure
+        
+        # Example listing structure:
+        # listing = {
+        #     "yard_name": self.get_name(),
+        #     "location": location_name,
+        #     "year": 2018,
+        #     "make": "Dodge",
+        #     "model": "RAM 2500",
+        #     "stock_number": "ABC123",
+        #     "url": f"{base_url}inventory/ABC123",
+        #     "arrival_date": "2026-02-11",
+        # }
+        # 
+        # if self.is_valid_listing(listing):
+        #     listings.append(listing)
         
-        for location_name, base_url in locations:
-            try:
-                logger.info(f"Scraping IPull-UPull {location_name}")
-                
-                # This is a placeholder implementation
-                # Real implementation would need to:
-                # 1. Check if IPull-UPull has an inventory API
-                # 2. Navigate to the inventory page
-                # 3. Filter for Dodge trucks
-                # 4. Parse results
-                
-                html = await self.fetch_page(base_url)
-                if not html:
-                    logger.warning(f"Failed to fetch IPull-UPull {location_name}")
-                    continue
-                
-                soup = self.parse_html(html)
-                if not soup:
-                    continue
-                
-                # Real scraping logic would go here
-                # This is a placeholder that would need to be implemented
-                # based on actual website structure
-                
-                # Example listing structure:
-                # listing = {
-                #     "yard_name": self.get_name(),
-                #     "location": location_name,
-                #     "year": 2018,
-                #     "make": "Dodge",
-                #     "model": "RAM 2500",
-                #     "stock_number": "ABC123",
-                #     "url": f"{base_url}inventory/ABC123",
-                #     "arrival_date": "2026-02-11",
-                # }
-                # 
-                # if self.is_valid_listing(listing):
-                #     listings.append(listing)
-                
-                logger.info(f"Found {len(listings)} valid listings at IPull-UPull {location_name}")
-                
-            except Exception as e:
-                logger.error(f"Error scraping IPull-UPull {location_name}: {e}")
+        logger.info(f"Found {len(listings)} valid listings at IPull-UPull {location_name}")
         
         return listings
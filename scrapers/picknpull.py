@@ -5,12 +5,20 @@ Website: picknpull.com
 
 import logging
 from typing import List
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, NOT_MODIFIED
 from utils import parse_year
 
 
 logger = logging.getLogger("dodge_truck_notifier.scraper.picknpull")
 
+# Pick-n-Pull Calgary and Edmonton locations
+# Note: The actual URLs and scraping logic would need to be adjusted
+# based on the real website structure
+_LOCATIONS = (
+    ("Calgary", "https://www.picknpull.com/check-inventory/vehicle-finder"),
+    ("Edmonton", "https://www.picknpull.com/check-inventory/vehicle-finder"),
+)
+
 
 class PickNPullScraper(BaseScraper):
     """Scraper for Pick-n-Pull salvage yards."""
@@ -26,59 +34,64 @@ class PickNPullScraper(BaseScraper):
         Returns:
             List of listing dictionaries
         """
+        # Locations are independent, so fetch them concurrently
+        return await self.scrape_locations(_LOCATIONS)
+    
+    async def _scrape_location(self, location_name: str, base_url: str) -> List[dict]:
+        """
+        Scrape a single Pick-n-Pull location.
+        
+        Args:
+            location_name: Name of the location (e.g. "Calgary")
+            base_url: URL of the location's inventory page
+        
+        Returns:
+            List of listing dictionaries for this location
+        """
         listings = []
         
-        # Pick-n-Pull Calgary and Edmonton locations
-        # Note: The actual URLs and scraping logic would need to be adjusted
-        # based on the real website structure
-        locations = [
-            ("Calgary", "https://www.picknpull.com/check-inventory/vehicle-finder"),
-            ("Edmonton", "https://www.picknpull.com/check-inventory/vehicle-finder"),
-        ]
+        logger.info(f"Scraping Pick-n-Pull {location_name}")
+        
+        # This is a placeholder implementation
+        # Real implementation would need to:
+        # 1. Check if Pick-n-Pull has an API
+        # 2. Navigate to the inventory search page
+        # 3. Submit search form for Dodge trucks
+        # 4. Parse results
+        
+        # For demonstration, attempting to fetch the page
+        html = await self.fetch_page(base_url, location_name)
+        if html is NOT_MODIFIED:
+            logger.info(f"Pick-n-Pull {location_name} unchanged since last check")
+            return listings
+        
+        if not html:
+            logger.warning(f"Failed to fetch Pick-n-Pull {location_name}")
+            return listings
+        
+        tree = self.parse_html_fast(html)
+        if not tree:
+            return listings
+        
+        # Real scraping logic would go here
+        # This is a placeholder that would need to be implemented
+        # based on actual website structure
+        
+        # Example of what a listing might look like:
+        # listing = {
+        #     "yard_name": self.get_name(),
+        #     "location": location_name,
+        #     "year": 2015,
+        #     "make": "Dodge",
+        #     "model": "RAM 1500",
+        #     "stock_number": "12345",
+        #     "url": "https://www.picknpull.com/inventory/12345",
+        #     "arrival_date": "2026-02-10",
+        # }
+        # 
+        # if self.is_valid_listing(listing):
+        #     listings.append(listing)
         
-        for location_name, base_url in locations:
-            try:
-                logger.info(f"Scraping Pick-n-Pull {location_name}")
-                
-                # This is a placeholder implementation
-                # Real implementation would need to:
-                # 1. Check if Pick-n-Pull has an API
-                # 2. Navigate to the inventory search page
-                # 3. Submit search form for Dodge trucks
-                # 4. Parse results
-                
-                # For demonstration, attempting to fetch the page
-                html = await self.fetch_page(base_url)
-                if not html:
-                    logger.warning(f"Failed to fetch Pick-n-Pull {location_name}")
-                    continue
-                
-                soup = self.parse_html(html)
-                if not soup:
-                    continue
-                
-                # Real scraping logic would go here
-                # This is a placeholder that would need to be implemented
-                # based on actual website structure
-                
-                # Example of what a listing might look like:
-                # listing = {
-                #     "yard_name": self.get_name(),
-                #     "location": location_name,
-                #     "year": 2015,
-                #     "make": "Dodge",
-                #     "model": "RAM 1500",
-                #     "stock_number": "12345",
-                #     "url": "https://www.picknpull.com/inventory/12345",
-                #     "arrival_date": "2026-02-10",
-                # }
-                # 
-                # if self.is_valid_listing(listing):
-                #     listings.append(listing)
-                
-                logger.info(f"Found {len(listings)} valid listings at Pick-n-Pull {location_name}")
-                
-            except Exception as e:
-                logger.error(f"Error scraping Pick-n-Pull {location_name}: {e}")
+        logger.info(f"Found {len(listings)} valid listings at Pick-n-Pull {location_name}")
         
         return listings
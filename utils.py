@@ -2,9 +2,29 @@
 Utility functions for the Dodge Truck Notifier bot.
 """
 
+import atexit
+import functools
+import hashlib
 import logging
+import logging.handlers
+import queue
+import re
 from datetime import datetime
 from typing import Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+
+# Query parameters that only track the visit and never identify a listing
+TRACKING_PARAMS = frozenset({"fbclid", "gclid"})
+
+# First run of four digits in a year field
+_YEAR_RE = re.compile(r"\d{4}")
+
+# Shared by every handler setup_logging installs
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
 
 
 def setup_logging(log_level: str = "INFO") -> logging.Logger:
@@ -17,23 +37,38 @@ def setup_logging(log_level: str = "INFO") -> logging.Logger:
     Returns:
         Logger instance
     """
+    level = getattr(logging, log_level.upper(), logging.INFO)
     logger = logging.getLogger("dodge_truck_notifier")
-    logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+    logger.setLevel(level)
     
-    # Console handler
+    # Already configured: don't build a handler only to discard it
+    if logger.handlers:
+        return logger
+    
+    # Skip the thread, process and caller-frame lookups LogRecord does for
+    # every record; the log format uses none of them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+    
+    # Console handler, fed by a listener thread so log calls only enqueue
+    # the record instead of blocking on the stderr write
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+    console_handler.setLevel(level)
+    console_handler.setFormatter(_FORMATTER)
     
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(level)
+    logger.addHandler(queue_handler)
     
-    # Add handler if not already present
-    if not logger.handlers:
-        logger.addHandler(console_handler)
+    listener = logging.handlers.QueueListener(
+        log_queue, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    # Drain queued records before the interpreter exits
+    atexit.register(listener.stop)
     
     return logger
 
@@ -55,13 +90,29 @@ def is_year_in_range(year: Optional[int], min_year: int, max_year: int) -> bool:
     return min_year <= year <= max_year
 
 
-def is_target_location(location: str, target_locations: list[str]) -> bool:
+def compile_target_locations(target_locations: list[str]) -> re.Pattern:
+    """
+    Build a case-insensitive pattern matching any of the target locations.
+    
+    Args:
+        target_locations: List of target locations
+    
+    Returns:
+        Compiled pattern for use with is_target_location
+    """
+    if not target_locations:
+        # Never matches, like an empty target list
+        return re.compile(r"(?!)")
+    return re.compile("|".join(map(re.escape, target_locations)), re.IGNORECASE)
+
+
+def is_target_location(location: str, target_pattern: re.Pattern) -> bool:
     """
     Check if a location is in the target locations list.
     
     Args:
         location: The location to check
-        target_locations: List of target locations
+        target_pattern: Pattern from compile_target_locations
     
     Returns:
         True if location matches, False otherwise
@@ -69,8 +120,50 @@ def is_target_location(location: str, target_locations: list[str]) -> bool:
     if not location:
         return False
     
-    location_lower = location.lower()
-    return any(target.lower() in location_lower for target in target_locations)
+    return _matches_target_location(location, target_pattern)
+
+
+@functools.lru_cache(maxsize=4096)
+def _matches_target_location(location: str, target_pattern: re.Pattern) -> bool:
+    """Search a location for the targets; memoized since yard locations repeat."""
+    return target_pattern.search(location) is not None
+
+
+def _make_model_field(get) -> Optional[str]:
+    """Combined make and model for the message, if either is present."""
+    make = get("make", "")
+    model = get("model", "")
+    if make or model:
+        return f"{make} {model}"
+    return None
+
+
+def _yard_field(get) -> Optional[str]:
+    """Yard name with its location appended, if a yard name is present."""
+    yard_info = get("yard_name")
+    location = get("location")
+    if yard_info and location:
+        yard_info += f" - {location}"
+    return yard_info
+
+
+# Message lines in order: (emoji, label, listing key or function of the
+# listing's bound get method)
+_MESSAGE_FIELDS = (
+    ("📅", "Year", "year"),
+    ("🚗", "Make/Model", _make_model_field),
+    ("🏢", "Yard", _yard_field),
+    ("🔗", "Link", "url"),
+    ("📦", "Stock #", "stock_number"),
+    ("📍", "Arrived", "arrival_date"),
+)
+
+# The same table resolved once up front: each line's constant prefix is
+# rendered and whether the field is a function is known ahead of time
+_MESSAGE_LINES = tuple(
+    (f"{emoji} **{label}:** ", field, callable(field))
+    for emoji, label, field in _MESSAGE_FIELDS
+)
 
 
 def format_discord_message(listing: dict) -> str:
@@ -83,35 +176,22 @@ def format_discord_message(listing: dict) -> str:
     Returns:
         Formatted message string
     """
-    message = "🚨 **New Dodge Truck Listing!**\n\n"
-    
-    if listing.get("year"):
-        message += f"📅 **Year:** {listing['year']}\n"
-    
-    if listing.get("make") or listing.get("model"):
-        make = listing.get("make", "")
-        model = listing.get("model", "")
-        message += f"🚗 **Make/Model:** {make} {model}\n"
-    
-    if listing.get("yard_name"):
-        yard_info = listing["yard_name"]
-        if listing.get("location"):
-            yard_info += f" - {listing['location']}"
-        message += f"🏢 **Yard:** {yard_info}\n"
-    
-    if listing.get("url"):
-        message += f"🔗 **Link:** {listing['url']}\n"
-    
-    if listing.get("stock_number"):
-        message += f"📦 **Stock #:** {listing['stock_number']}\n"
+    # Collect the fragments and join once rather than re-copying the
+    # message on every append
+    parts = ["🚨 **New Dodge Truck Listing!**\n\n"]
     
-    if listing.get("arrival_date"):
-        message += f"📍 **Arrived:** {listing['arrival_date']}\n"
+    # Bind the lookup once instead of resolving listing.get per field
+    get = listing.get
+    for prefix, field, is_function in _MESSAGE_LINES:
+        value = field(get) if is_function else get(field)
+        if value:
+            parts.append(f"{prefix}{value}\n")
     
-    if listing.get("notes"):
-        message += f"\n💬 {listing['notes']}\n"
+    notes = get("notes")
+    if notes:
+        parts.append(f"\n💬 {notes}\n")
     
-    return message
+    return "".join(parts)
 
 
 def parse_year(year_str: str) -> Optional[int]:
@@ -127,14 +207,44 @@ def parse_year(year_str: str) -> Optional[int]:
     if not year_str:
         return None
     
-    try:
-        # Remove any non-digit characters
-        year_digits = ''.join(c for c in str(year_str) if c.isdigit())
-        if len(year_digits) >= 4:
-            return int(year_digits[:4])
-        return None
-    except (ValueError, TypeError):
-        return None
+    return _parse_year_str(year_str if isinstance(year_str, str) else str(year_str))
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_year_str(year_str: str) -> Optional[int]:
+    """Parse a non-empty year string; memoized since year values repeat."""
+    match = _YEAR_RE.search(year_str)
+    return int(match.group()) if match else None
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so the same page always yields the same string.
+    
+    Lowercases the scheme and host, drops the fragment and tracking
+    query parameters, and removes trailing slashes from the path.
+    
+    Args:
+        url: The URL to normalize
+    
+    Returns:
+        Normalized URL string
+    """
+    parts = urlsplit(url.strip())
+    
+    query = urlencode([
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ])
+    
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip("/"),
+        query,
+        ""
+    ))
 
 
 def generate_listing_id(listing: dict) -> str:
@@ -145,20 +255,23 @@ def generate_listing_id(listing: dict) -> str:
         listing: Dictionary containing listing information
     
     Returns:
-        Unique identifier string
+        Unique identifier string (32 hex characters)
     """
     # Use URL if available as it's the most reliable unique identifier
     if listing.get("url"):
-        return listing["url"]
-    
-    # Otherwise, create a composite key
-    parts = [
-        listing.get("yard_name", ""),
-        listing.get("location", ""),
-        str(listing.get("year", "")),
-        listing.get("make", ""),
-        listing.get("model", ""),
-        listing.get("stock_number", ""),
-    ]
-    
-    return "|".join(parts)
+        key = normalize_url(listing["url"]).encode("utf-8")
+    else:
+        # Otherwise, create a composite key
+        parts = [
+            listing.get("yard_name", ""),
+            listing.get("location", ""),
+            listing.get("year", ""),
+            listing.get("make", ""),
+            listing.get("model", ""),
+            listing.get("stock_number", ""),
+        ]
+        # Unit separator can't appear in scraped fields
+        key = b"\x1f".join(str(part).encode("utf-8") for part in parts)
+    
+    # Hash to a fixed-width key so lookups don't depend on URL length
+    return hashlib.blake2b(key, digest_size=16).hexdigest()